@@ -0,0 +1,56 @@
+import logging
+from lxml import etree
+
+# Kept separate from scraper.py so spawned parse workers only need to import lxml
+
+logger = logging.getLogger(__name__)
+
+# Compiled XPath expressions for the fields of a question container
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+Q_XPATH = etree.XPath(f".//*[{_has_class('bix-td-qtxt')}]")
+OPT_XPATH = etree.XPath(f".//*[{_has_class('bix-tbl-options')}]//*[{_has_class('bix-opt-row')}]//*[{_has_class('bix-td-option-val')}]")
+HID_XPATH = etree.XPath(f".//input[{_has_class('jq-hdnakq')}]")
+EXP_XPATH = etree.XPath(f".//*[{_has_class('bix-div-answer')}]//*[{_has_class('bix-ans-description')}]")
+TEXT_XPATH = etree.XPath("string()", smart_strings=False)
+PARSE_CHUNK_SIZE = 64 * 1024
+
+def parse_question(question_div):
+    qtxt = TEXT_XPATH(Q_XPATH(question_div)[0]).strip()
+    options = [TEXT_XPATH(option).strip() for option in OPT_XPATH(question_div)]
+
+    hidden_inputs = HID_XPATH(question_div)
+    value = hidden_inputs[0].get("value") if hidden_inputs else None
+    value_in_braces = value.split('{', 1)[-1].rsplit('}', 1)[0] if value is not None else ""
+
+    explanation = TEXT_XPATH(EXP_XPATH(question_div)[0]).strip()
+
+    return {
+        "question": qtxt,
+        "options": options,
+        "value_in_braces": value_in_braces,
+        "explanation": explanation
+    }
+
+def parse_questions(html):
+    if not html:
+        return []
+
+    # Stream the page and drop each question container once it has been read
+    parser = etree.HTMLPullParser(events=("end",), tag="div")
+    records = []
+    for offset in range(0, len(html), PARSE_CHUNK_SIZE):
+        parser.feed(html[offset:offset + PARSE_CHUNK_SIZE])
+        for _, elem in parser.read_events():
+            if "bix-div-container" not in elem.get("class", "").split():
+                continue
+            try:
+                records.append(parse_question(elem))
+            except Exception as e:
+                logger.error(f"Error scraping content: {e}")
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    parser.close()
+    return records
@@ -0,0 +1,446 @@
+import logging
+import asyncio
+import hashlib
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
+from aiohttp import web
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urljoin
+from question_parser import parse_questions
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from google.api_core import retry as api_retry
+from google.api_core.exceptions import (
+    DeadlineExceeded, GoogleAPIError, InternalServerError, RetryError, ServiceUnavailable, TooManyRequests
+)
+from google.cloud import translate_v3
+from telegram import Bot
+from telegram.constants import PollType, ParseMode
+from telegram.error import RetryAfter, TelegramError
+from datetime import datetime, timedelta
+import os
+import pytz
+
+# Configuration
+MONGO_CONNECTION_STRING = os.environ.get('MONGO_CONNECTION_STRING')
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHANNEL_USERNAME = os.environ.get('TELEGRAM_CHANNEL_USERNAME')
+PORT = int(os.environ.get('PORT', 8080))
+BASE_URL = "https://www.indiabix.com/"
+GOOGLE_CLOUD_PROJECT = os.environ.get('GOOGLE_CLOUD_PROJECT')
+
+# HTTP client settings
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_connect=5)
+HTTP_CONNECTION_LIMIT = 16
+HTTP_CONNECTIONS_PER_HOST = 6
+HTTP_DNS_CACHE_TTL = 300
+HTTP_HEADERS = {"Connection": "keep-alive"}
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Maximum number of pages translated at the same time
+TRANSLATE_CONCURRENCY = 4
+
+# Per-request limits of the Cloud Translation translate_text API
+TRANSLATE_MAX_STRINGS = 1024
+TRANSLATE_MAX_CODEPOINTS = 30000
+
+# Retry transient Cloud Translation failures with exponential backoff
+TRANSLATE_TIMEOUT = 60
+TRANSLATE_TRANSIENT_ERRORS = (DeadlineExceeded, InternalServerError, ServiceUnavailable, TooManyRequests)
+TRANSLATE_RETRY = api_retry.Retry(
+    predicate=api_retry.if_exception_type(*TRANSLATE_TRANSIENT_ERRORS),
+    initial=1.0,
+    maximum=10.0,
+    multiplier=2.0,
+    timeout=120.0
+)
+
+# Telegram polls in flight at once, and the pause each slot takes after a send
+TELEGRAM_CONCURRENCY = 3
+TELEGRAM_SEND_INTERVAL = 1.05
+
+# Telegram quiz poll length limits
+POLL_QUESTION_MAX_LENGTH = 300
+POLL_OPTION_MAX_LENGTH = 100
+POLL_EXPLANATION_MAX_LENGTH = 200
+
+# Scraped questions waiting to be posted to Telegram
+QUEUE_MAXSIZE = 64
+
+# Worker processes used to parse day pages
+PARSE_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Mapping of answer letters to option indexes
+_OPT_MAP = {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4}
+
+# Only parse the parts of each page we actually read
+INDEX_LINKS_STRAINER = SoupStrainer("a", class_="text-link me-3")
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class GoogleTranslatorWrapper:
+    def __init__(self, cache_collection, target="gu"):
+        self.client = translate_v3.TranslationServiceClient()
+        self.parent = f"projects/{GOOGLE_CLOUD_PROJECT}/locations/global"
+        self.target = target
+        self._cache = {}
+        self.cache_collection = cache_collection
+
+    def _hash(self, text):
+        return hashlib.sha1(f"{self.target}:{text}".encode()).hexdigest()
+
+    async def _load_cached(self, texts):
+        hashes = {self._hash(text): text for text in texts}
+        async for doc in self.cache_collection.find({"hash": {"$in": list(hashes)}}, projection={"_id": 0, "hash": 1, "tgt": 1}):
+            self._cache[hashes[doc["hash"]]] = doc["tgt"]
+
+    async def _store_cached(self, translated):
+        try:
+            await self.cache_collection.bulk_write([
+                UpdateOne(
+                    {"hash": self._hash(src)},
+                    {"$setOnInsert": {"hash": self._hash(src), "src": src, "tgt": tgt, "tgt_lang": self.target}},
+                    upsert=True
+                )
+                for src, tgt in translated.items()
+            ], ordered=False)
+        except BulkWriteError as e:
+            # Pages translated concurrently may race to upsert the same string
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                logger.error(f"Error caching translations: {e.details}")
+
+    def _request_batches(self, texts):
+        batch, size = [], 0
+        for text in texts:
+            if batch and (len(batch) == TRANSLATE_MAX_STRINGS or size + len(text) > TRANSLATE_MAX_CODEPOINTS):
+                yield batch
+                batch, size = [], 0
+            batch.append(text)
+            size += len(text)
+        if batch:
+            yield batch
+
+    def _translate_uncached(self, texts):
+        translated = {}
+        for batch in self._request_batches(texts):
+            try:
+                response = self.client.translate_text(
+                    request={
+                        "parent": self.parent,
+                        "contents": batch,
+                        "target_language_code": self.target,
+                        "mime_type": "text/plain"
+                    },
+                    retry=TRANSLATE_RETRY,
+                    timeout=TRANSLATE_TIMEOUT
+                )
+            except (RetryError, *TRANSLATE_TRANSIENT_ERRORS) as e:
+                # Other errors (bad credentials, disabled API, wrong project) propagate
+                # so the run stops instead of storing untranslated questions
+                logger.error(f"Translation error: {e}")
+                continue
+            translated.update(zip(batch, (translation.translated_text for translation in response.translations)))
+        return translated
+
+    async def translate_batch(self, texts):
+        unknown = list(dict.fromkeys(text for text in texts if text and text not in self._cache))
+        if unknown:
+            await self._load_cached(unknown)
+            unknown = [text for text in unknown if text not in self._cache]
+        if unknown:
+            # The Cloud Translation client is blocking, so keep it off the event loop
+            translated = await asyncio.to_thread(self._translate_uncached, unknown)
+            if translated:
+                self._cache.update(translated)
+                await self._store_cached(translated)
+        return {text: self._cache.get(text, text) for text in texts}  # Fall back to original text if translation failed
+
+class MongoDBManager:
+    def __init__(self):
+        self.client = AsyncIOMotorClient(MONGO_CONNECTION_STRING, maxPoolSize=20)
+        self.db = self.client["current_affairs"]
+
+    async def get_translation_collection(self):
+        collection = self.db["translations"]
+        await collection.create_index("hash", unique=True)
+        return collection
+
+    async def get_or_create_collection(self, year, month):
+        collection = self.db[str(year)][str(month)]
+        await collection.create_index("day")
+        return collection
+
+    async def get_existing_days(self, collection, days):
+        return set(await collection.distinct("day", {"day": {"$in": days}}))
+
+    async def insert_questions(self, collection, question_docs):
+        # Returns the documents that were actually stored
+        try:
+            await collection.insert_many(question_docs, ordered=False)
+            return question_docs
+        except BulkWriteError as e:
+            logger.error(f"Error inserting questions: {e.details}")
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            return [doc for i, doc in enumerate(question_docs) if i not in failed]
+        except PyMongoError as e:
+            logger.error(f"Error inserting questions: {e}")
+            return []
+
+    def close_connection(self):
+        self.client.close()
+
+class TelegramQuizBot:
+    def __init__(self, token, channel_username):
+        self.bot = Bot(token=token)
+        self.channel_username = channel_username
+
+    async def send_poll(self, question_doc):
+        # Texts are already truncated to Telegram's limits when scraped
+        question = question_doc["question"]
+        options = question_doc["options"]
+        correct_option = question_doc["value_in_braces"]
+        explanation = question_doc["explanation"]
+
+        correct_option_id = _OPT_MAP.get(correct_option)
+        if correct_option_id is None or correct_option_id >= len(options):
+            logger.error(f"Correct option '{correct_option}' not found in options: {options}")
+            return
+
+        while True:
+            try:
+                await self.bot.send_poll(
+                    chat_id=self.channel_username,
+                    question=question,
+                    options=options,
+                    is_anonymous=True,
+                    type=PollType.QUIZ,
+                    correct_option_id=correct_option_id,
+                    explanation=explanation
+                )
+                logger.info(f"Sent poll: {question}")
+                return
+            except RetryAfter as e:
+                # The question is already stored, so keep waiting rather than dropping it
+                delay = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else e.retry_after
+                logger.warning(f"Rate limited by Telegram, retrying in {delay}s")
+                await asyncio.sleep(delay)
+            except TelegramError as e:
+                logger.error(f"Failed to send poll: {e.message}")
+                return
+
+def truncate_text(text, max_length):
+    return text[:max_length-3] + '...' if len(text) > max_length else text
+
+def get_current_date():
+    ist = pytz.timezone('Asia/Kolkata')
+    return datetime.now(ist)
+
+async def fetch(session, semaphore, url):
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        delay = HTTP_BACKOFF_FACTOR * (2 ** attempt)
+        async with semaphore:
+            try:
+                async with session.get(url, ssl=False) as response:
+                    if response.status not in HTTP_RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+                        response.raise_for_status()
+                        return await response.text()
+                    logger.warning(f"Got {response.status} for {url}, retrying in {delay}s")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == HTTP_MAX_RETRIES:
+                    raise
+                logger.warning(f"Error fetching {url} ({e!r}), retrying in {delay}s")
+        # Back off outside the semaphore so other fetches can use the slot
+        await asyncio.sleep(delay)
+
+async def scrape_questions_to_mongodb(queue):
+    try:
+        url = urljoin(BASE_URL, "/current-affairs/questions-and-answers/")
+        current_date = get_current_date()
+        link_re = re.compile(rf"/current-affairs/{current_date.year}-{current_date.month:02d}-\d{{2}}/?$")
+
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            ssl=False
+        )
+        fetch_semaphore = asyncio.Semaphore(HTTP_CONNECTIONS_PER_HOST)
+        loop = asyncio.get_running_loop()
+        # Spawn rather than fork: Motor's monitor threads and the to_thread pool
+        # are already running by the time the first page is submitted
+        with ProcessPoolExecutor(max_workers=PARSE_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")) as parse_pool:
+            async with aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS) as session:
+                html = await fetch(session, fetch_semaphore, url)
+                soup = await asyncio.to_thread(BeautifulSoup, html, 'lxml', parse_only=INDEX_LINKS_STRAINER)
+                link_elements = soup.find_all("a", class_="text-link me-3")
+
+                valid_links = []
+                for link_element in link_elements:
+                    href = link_element.get("href")
+                    if link_re.search(href or ""):
+                        full_url = urljoin(BASE_URL, href)
+                        valid_links.append(full_url)
+
+                mongo_manager = MongoDBManager()
+                translator = GoogleTranslatorWrapper(await mongo_manager.get_translation_collection())
+
+                links_by_month = {}
+                for full_url in valid_links:
+                    _, year, month, day = full_url.split("/")[-4:]
+                    day = day.rstrip('/')
+                    links_by_month.setdefault((year, month), []).append((full_url, day))
+
+                # One distinct() per month instead of a find_one() per day
+                pending = []
+                for (year, month), links in links_by_month.items():
+                    collection = await mongo_manager.get_or_create_collection(year, month)
+                    existing_days = await mongo_manager.get_existing_days(collection, [day for _, day in links])
+
+                    for full_url, day in links:
+                        if day in existing_days:
+                            logger.info(f"Data for {year}-{month}-{day} already exists. Skipping.")
+                            continue
+
+                        pending.append((full_url, collection, day))
+
+                # Scrape, translate and store each day-page concurrently, handing its
+                # questions to the Telegram consumers as soon as the page is stored
+                semaphore = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+
+                async def store_page(page, collection, day):
+                    # Parsing is CPU-bound, so spread it across processes instead of threads
+                    records = await loop.run_in_executor(parse_pool, parse_questions, page)
+
+                    page_strings = []
+                    for record in records:
+                        page_strings.extend([record["question"], *record["options"], record["explanation"]])
+
+                    # Translate every string on the page in a single batch
+                    async with semaphore:
+                        translations = await translator.translate_batch(page_strings)
+
+                    page_docs = []
+                    for record in records:
+                        correct_option = record["value_in_braces"].upper()
+                        correct_option_id = _OPT_MAP.get(correct_option, 0)
+
+                        question_doc = {
+                            "question": truncate_text(translations[record["question"]], POLL_QUESTION_MAX_LENGTH),
+                            "options": [truncate_text(translations[option], POLL_OPTION_MAX_LENGTH) for option in record["options"]],
+                            "value_in_braces": record["value_in_braces"],
+                            "explanation": truncate_text(translations[record["explanation"]], POLL_EXPLANATION_MAX_LENGTH),
+                            "correct_option_id": correct_option_id,
+                            "day": day
+                        }
+
+                        page_docs.append(question_doc)
+
+                    if page_docs:
+                        page_docs = await mongo_manager.insert_questions(collection, page_docs)
+                        for question_doc in page_docs:
+                            await queue.put(question_doc)
+                    return len(page_docs)
+
+                async def scrape_page(full_url, collection, day):
+                    try:
+                        page = await fetch(session, fetch_semaphore, full_url)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        logger.error(f"Error fetching {full_url}: {e!r}")
+                        return 0
+
+                    # A failure on one page must not stop the others, unless translation
+                    # is misconfigured and would fail for every page
+                    try:
+                        return await store_page(page, collection, day)
+                    except GoogleAPIError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Error scraping {full_url}: {e!r}")
+                        return 0
+
+                page_tasks = [asyncio.ensure_future(scrape_page(*page_args)) for page_args in pending]
+                try:
+                    page_counts = await asyncio.gather(*page_tasks)
+                except BaseException:
+                    for task in page_tasks:
+                        task.cancel()
+                    raise
+
+        mongo_manager.close_connection()
+        return sum(page_counts)
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching initial URL: {e}")
+        return 0
+
+async def send_new_questions_to_telegram(bot, queue):
+    async def worker():
+        while (question := await queue.get()) is not None:
+            # Keep draining the queue even if one poll fails unexpectedly
+            try:
+                await bot.send_poll(question)
+            except Exception as e:
+                logger.error(f"Unexpected error sending poll: {e!r}")
+            await asyncio.sleep(TELEGRAM_SEND_INTERVAL)
+
+    await asyncio.gather(*(worker() for _ in range(TELEGRAM_CONCURRENCY)))
+
+async def health(request):
+    return web.Response(text="ok")
+
+async def start_health_server():
+    app = web.Application()
+    app.router.add_get("/", health)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=PORT).start()
+    return runner
+
+async def main():
+    if not GOOGLE_CLOUD_PROJECT:
+        raise RuntimeError("GOOGLE_CLOUD_PROJECT environment variable is not set")
+    if not TELEGRAM_BOT_TOKEN:
+        raise RuntimeError("TELEGRAM_BOT_TOKEN environment variable is not set")
+    if not TELEGRAM_CHANNEL_USERNAME:
+        raise RuntimeError("TELEGRAM_CHANNEL_USERNAME environment variable is not set")
+
+    bot = TelegramQuizBot(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_USERNAME)
+
+    # Serve a health check on the same event loop while the job runs
+    runner = await start_health_server()
+    try:
+        queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        producer = asyncio.create_task(scrape_questions_to_mongodb(queue))
+        consumer = asyncio.create_task(send_new_questions_to_telegram(bot, queue))
+
+        async def send_end_markers():
+            # One end-of-stream marker per Telegram worker
+            for _ in range(TELEGRAM_CONCURRENCY):
+                await queue.put(None)
+
+        await asyncio.wait({producer, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        if consumer.done():
+            # The consumers only stop early by failing; nothing would drain the queue
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            consumer.result()
+        else:
+            # Let the consumers drain the queue even if the producer failed, but
+            # stop waiting on the full queue if they fail while doing so
+            end_markers = asyncio.create_task(send_end_markers())
+            await asyncio.wait({end_markers, consumer}, return_when=asyncio.FIRST_COMPLETED)
+            end_markers.cancel()
+            await consumer
+
+        new_question_count = producer.result()
+        if not new_question_count:
+            logger.info("No new questions found.")
+    finally:
+        await runner.cleanup()